@@ -1,17 +1,19 @@
-import time
 import json
-import random
+import time
+import asyncio
 import logging
+import functools
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import Dict
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
+import httpx
+from selectolax.parser import HTMLParser
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+try:
+    import orjson
+except ImportError:        # fall back to the stdlib serializer
+    orjson = None
 
 
 # Set up logging
@@ -21,6 +23,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Browser-like headers so the plain HTTP path gets the same markup a real visit would
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# Price selector alternatives, tried in priority order. Built once at import
+# so repeated scrapes reuse the same tuples instead of rebuilding lists per call;
+# selectolax compiles the selector strings internally in C on each css_first.
+AMAZON_PRICE_SELECTORS = (
+    "span.a-price-whole",
+    "span.a-price[data-a-size=xl] ",
+    "div.a-align-center, .aok-align-center",
+)
+FLIPKART_PRICE_SELECTORS = (
+    "div.C7fEHH ",
+    "div.UOCQB1",
+    "div.hl05eU .Nx9bqj",
+)
+
+# Single-field selectors and the any-of sentinels that signal a rendered
+# product page, shared by the HTTP and fallback paths
+AMAZON_STOCK_SELECTOR = "#availability"
+AMAZON_RATING_SELECTOR = "span.a-icon-alt"
+AMAZON_REVIEW_SELECTOR = "#acrCustomerReviewText"
+AMAZON_PAGE_SENTINEL = "#availability, #acrCustomerReviewText, span.a-price-whole"
+
+FLIPKART_STOCK_SELECTOR = "._16FRp0"
+FLIPKART_RATING_SELECTOR = "div.XQDdHH"
+FLIPKART_REVIEW_SELECTOR = "span.Y1HWO0"
+FLIPKART_PAGE_SENTINEL = "div.hl05eU .Nx9bqj, div.XQDdHH, ._16FRp0"
+
+# Strips the rupee sign, digit grouping and (non-breaking) spaces in one
+# C-level pass with no intermediate string allocations
+_PRICE_TRANS = str.maketrans({'₹': None, ',': None, ' ': None, '\xa0': None})
+
+@functools.lru_cache(maxsize=1)
+def _format_now(second: int) -> str:
+    return datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+
+def _now_str() -> str:
+    """Current wall-clock string, cached per second - strftime is ~5us a call"""
+    return _format_now(int(time.time()))
+
 @dataclass
 class ProductDetails:
     """Data class to store product information"""
@@ -31,201 +81,349 @@ class ProductDetails:
     seller: str = "Unknown"
     platform: str = "Unknown"
     url: str = ""
-    timestamp: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-class SeleniumScraperBase:
-    """Base class for Selenium-based scrapers"""
+    timestamp: str = ""
+
+    def __post_init__(self):
+        # A datetime.now() field default would be evaluated once at import
+        # and shared by every instance, so stamp each one here instead
+        if not self.timestamp:
+            self.timestamp = _now_str()
+
+class PlaywrightScraperBase:
+    """Base class for scrapers that render pages through Playwright.
+
+    One headless Edge process is shared by every scraper and kept warm for
+    the lifetime of the event loop; each scrape gets a fresh page (a cheap
+    tab, ~10ms) instead of a separate driver process, and Playwright talks
+    CDP directly rather than going through the WebDriver wire protocol.
+    """
+
+    _playwright = None
+    _browser = None
+    _browser_lock = asyncio.Lock()
+
+    @classmethod
+    async def _get_browser(cls):
+        """Launch the shared browser on first use"""
+        async with cls._browser_lock:
+            if cls._browser is None:
+                cls._playwright = await async_playwright().start()
+                cls._browser = await cls._playwright.chromium.launch(
+                    channel="msedge",
+                    headless=True,
+                )
+            return cls._browser
+
+    @classmethod
+    async def close_browser(cls):
+        """Shut the shared browser down once all analyses are finished"""
+        async with cls._browser_lock:
+            if cls._browser is not None:
+                try:
+                    await cls._browser.close()
+                except:
+                    pass
+                cls._browser = None
+            if cls._playwright is not None:
+                try:
+                    await cls._playwright.stop()
+                except:
+                    pass
+                cls._playwright = None
+
+    @staticmethod
+    async def _block_media(route):
+        # None of our selectors read rendered images/styles, so drop the
+        # 3-8MB of media a product page carries before it is fetched
+        if route.request.resource_type in ("image", "stylesheet", "font", "media"):
+            await route.abort()
+        else:
+            await route.continue_()
 
-    def __init__(self):
-        self.driver = self._setup_driver
-
-    @property
-    def _setup_driver(self):
-        """Setup Edge driver with appropriate options"""
-        edge_options = Options()
-        edge_options.add_argument("--start-maximized")
-        edge_options.add_argument("--disable-notifications")
-        edge_options.add_argument("--disable-popup-blocking")
-        edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        edge_options.add_experimental_option('useAutomationExtension', False)
-
-        service = Service("./msedgedriver.exe")        # Update with your path
-        return webdriver.Edge(service=service, options=edge_options)
-
-    def _wait_and_get_element(self, by, selector, timeout=10):
-        """Wait for element and return it when available"""
+    async def _render_page(self, url: str, sentinel: str) -> str:
+        """Render url in a fresh page and return its HTML"""
+        browser = await self._get_browser()
+        page = await browser.new_page()
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, selector))
-            )
-            return element
-        except TimeoutException:
-            return None
-
-    def _safe_get_text(self, element):
-        """Safely get text from element"""
-        try:
-            return element.text.strip() if element else ""
-        except:
-            return ""
-
-class AmazonScraper(SeleniumScraperBase):
+            await page.route("**/*", self._block_media)
+            await page.goto(url, wait_until="domcontentloaded")
+            # Wait for any sentinel element instead of sleeping blindly; a
+            # timeout falls through to parsing whatever did render
+            try:
+                await page.wait_for_selector(sentinel, state="attached", timeout=8000)
+            except PlaywrightTimeoutError:
+                pass
+            return await page.content()
+        finally:
+            await page.close()
+
+class HttpScraperBase(PlaywrightScraperBase):
+    """Base class for scrapers that fetch over plain HTTP and parse the raw HTML.
+
+    Both target sites return price/rating/review markup in the initial page,
+    so a direct GET plus selectolax parsing replaces the full browser for the
+    common case. The rendered-browser path is kept only as a fallback for
+    bot walls.
+    """
+
+    # Cap on concurrent requests per client, replacing the old random sleeps
+    MAX_CONCURRENT_REQUESTS = 4
+
+    def __init__(self, client=None):
+        # Scrapers normally share one client (see ProductAnalyzer) so batch
+        # scrapes multiplex over the same warm HTTP/2 connections instead of
+        # paying a TCP+TLS handshake per request
+        self.client = client if client is not None else self.build_client()
+        self._rate_limit = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+    @staticmethod
+    def build_client() -> httpx.AsyncClient:
+        """An HTTP/2 client with keep-alive pooling sized for batch scrapes"""
+        return httpx.AsyncClient(
+            http2=True,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+        )
+
+    async def _fetch_tree(self, url: str) -> HTMLParser:
+        """GET the page and return a parsed selectolax tree"""
+        async with self._rate_limit:
+            response = await self.client.get(url)
+        # Hand lexbor the raw bytes; both sites serve UTF-8, so there is no
+        # need to decode a multi-MB body into a Python str first
+        return HTMLParser(response.content)
+
+    def _node_text(self, node):
+        """Safely get stripped text from a selectolax node"""
+        return node.text(strip=True) if node else ""
+
+class AmazonScraper(HttpScraperBase):
     """Scraper for Amazon products"""
 
-    def scrape_product(self, url: str) -> ProductDetails:
+    async def scrape_product(self, url: str) -> ProductDetails:
         details = ProductDetails(platform="Amazon", url=url)
 
         try:
-            self.driver.get(url)
-            time.sleep(random.uniform(4, 6))
-
-            # Price
-            price_selectors = [
-                "span.a-price-whole",
-                "span.a-price[data-a-size=xl] ",
-                "div.a-align-center, .aok-align-center"
-            ]
-
-            for selector in price_selectors:
-                price_elem = self._wait_and_get_element(By.CSS_SELECTOR, selector)
-                if price_elem:
-                    price_text = self._safe_get_text(price_elem)
-                    try:
-                        details.price = float(price_text.replace('₹', '').replace(',', ''))
-                        break
-                    except ValueError:
-                        continue
-
-            # Stock Status
-            stock_elem = self._wait_and_get_element(By.CSS_SELECTOR, "#availability")
-            if stock_elem:
-                details.stock_status = self._safe_get_text(stock_elem)
-
-            # Rating
-            rating_elem = self._wait_and_get_element(By.CSS_SELECTOR, "span.a-icon-alt")
-            if rating_elem:
-                rating_text = self._safe_get_text(rating_elem)
-                try:
-                    details.rating = float(rating_text.split()[0])
-                except (ValueError, IndexError):
-                    pass
+            tree = await self._fetch_tree(url)
 
-            # Review Count
-            review_elem = self._wait_and_get_element(By.CSS_SELECTOR, "#acrCustomerReviewText")
-            if review_elem:
-                review_text = self._safe_get_text(review_elem)
-                try:
-                    details.review_count = int(review_text.split()[0].replace(',', ''))
-                except (ValueError, IndexError):
-                    pass
+            # No price markup at all usually means a bot wall; retry with a real browser
+            if not self._parse_tree(tree, details):
+                logger.warning("No price markup in HTTP response for %s, falling back to rendering", url)
+                return await self._scrape_with_browser(url)
+
+            # Guarded so the asdict() allocation is skipped when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully scraped Amazon product: %s", asdict(details))
+            return details
+
+        except Exception as e:
+            logger.error("Error scraping Amazon product: %s", e)
+            return details
+
+    async def _scrape_with_browser(self, url: str) -> ProductDetails:
+        """Rendered-browser fallback for pages that refuse the plain HTTP path"""
+        details = ProductDetails(platform="Amazon", url=url)
+
+        try:
+            html = await self._render_page(url, AMAZON_PAGE_SENTINEL)
+            self._parse_tree(HTMLParser(html), details)
 
-            logger.info(f"Successfully scraped Amazon product: {vars(details)}")
+            # Guarded so the asdict() allocation is skipped when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully scraped Amazon product: %s", asdict(details))
             return details
 
         except Exception as e:
-            logger.error(f"Error scraping Amazon product: {str(e)}")
+            logger.error("Error scraping Amazon product: %s", e)
             return details
 
-class FlipkartScraper(SeleniumScraperBase):
+    def _parse_tree(self, tree: HTMLParser, details: ProductDetails) -> bool:
+        """Extract price/stock/rating/reviews from a parsed page.
+
+        Returns False when no price markup was present at all.
+        """
+        # Price
+        price_found = False
+        for selector in AMAZON_PRICE_SELECTORS:
+            price_node = tree.css_first(selector)
+            if price_node:
+                price_found = True
+                price_text = self._node_text(price_node)
+                try:
+                    details.price = float(price_text.translate(_PRICE_TRANS))
+                    break
+                except ValueError:
+                    continue
+
+        if not price_found:
+            return False
+
+        # Stock Status
+        stock_node = tree.css_first(AMAZON_STOCK_SELECTOR)
+        if stock_node:
+            details.stock_status = self._node_text(stock_node)
+
+        # Rating
+        rating_node = tree.css_first(AMAZON_RATING_SELECTOR)
+        if rating_node:
+            rating_text = self._node_text(rating_node)
+            try:
+                details.rating = float(rating_text.split()[0])
+            except (ValueError, IndexError):
+                pass
+
+        # Review Count
+        review_node = tree.css_first(AMAZON_REVIEW_SELECTOR)
+        if review_node:
+            review_text = self._node_text(review_node)
+            try:
+                details.review_count = int(review_text.split()[0].translate(_PRICE_TRANS))
+            except (ValueError, IndexError):
+                pass
+
+        return True
+
+class FlipkartScraper(HttpScraperBase):
     """Scraper for Flipkart products"""
 
-    def scrape_product(self, url: str) -> ProductDetails:
+    async def scrape_product(self, url: str) -> ProductDetails:
         details = ProductDetails(platform="Flipkart", url=url)
 
         try:
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
-
-            # Price
-            price_selectors = [
-                "div.C7fEHH ",
-                "div.UOCQB1",
-                "div.hl05eU .Nx9bqj"
-            ]
-
-            for selector in price_selectors:
-                price_elem = self._wait_and_get_element(By.CSS_SELECTOR, selector)
-                if price_elem:
-                    price_text = self._safe_get_text(price_elem)
-                    try:
-                        details.price = float(price_text.replace('₹', '').replace(',', ''))
-                        break
-                    except ValueError:
-                        continue
-
-            # Stock Status
-            stock_elem = self._wait_and_get_element(By.CSS_SELECTOR, "._16FRp0")
-            details.stock_status = "Out of Stock" if stock_elem else "In Stock"
-
-            # Rating
-            rating_elem = self._wait_and_get_element(By.CSS_SELECTOR, "div.XQDdHH")
-            if rating_elem:
-                rating_text = self._safe_get_text(rating_elem)
-                try:
-                    details.rating = float(rating_text)
-                except ValueError:
-                    pass
+            tree = await self._fetch_tree(url)
 
-            # Review Count
-            review_elem = self._wait_and_get_element(By.CSS_SELECTOR, "span.Y1HWO0")
-            if review_elem:
-                review_text = self._safe_get_text(review_elem)
-                try:
-                    details.review_count = int(review_text.split()[0].replace(',', ''))
-                except (ValueError, IndexError):
-                    pass
+            # No price markup at all usually means a bot wall; retry with a real browser
+            if not self._parse_tree(tree, details):
+                logger.warning("No price markup in HTTP response for %s, falling back to rendering", url)
+                return await self._scrape_with_browser(url)
+
+            # Guarded so the asdict() allocation is skipped when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully scraped Flipkart product: %s", asdict(details))
+            return details
+
+        except Exception as e:
+            logger.error("Error scraping Flipkart product: %s", e)
+            return details
+
+    async def _scrape_with_browser(self, url: str) -> ProductDetails:
+        """Rendered-browser fallback for pages that refuse the plain HTTP path"""
+        details = ProductDetails(platform="Flipkart", url=url)
 
-            logger.info(f"Successfully scraped Flipkart product: {vars(details)}")
+        try:
+            html = await self._render_page(url, FLIPKART_PAGE_SENTINEL)
+            self._parse_tree(HTMLParser(html), details)
+
+            # Guarded so the asdict() allocation is skipped when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully scraped Flipkart product: %s", asdict(details))
             return details
 
         except Exception as e:
-            logger.error(f"Error scraping Flipkart product: {str(e)}")
+            logger.error("Error scraping Flipkart product: %s", e)
             return details
 
+    def _parse_tree(self, tree: HTMLParser, details: ProductDetails) -> bool:
+        """Extract price/stock/rating/reviews from a parsed page.
+
+        Returns False when no price markup was present at all.
+        """
+        # Price
+        price_found = False
+        for selector in FLIPKART_PRICE_SELECTORS:
+            price_node = tree.css_first(selector)
+            if price_node:
+                price_found = True
+                price_text = self._node_text(price_node)
+                try:
+                    details.price = float(price_text.translate(_PRICE_TRANS))
+                    break
+                except ValueError:
+                    continue
+
+        if not price_found:
+            return False
+
+        # Stock Status
+        stock_node = tree.css_first(FLIPKART_STOCK_SELECTOR)
+        details.stock_status = "Out of Stock" if stock_node else "In Stock"
+
+        # Rating
+        rating_node = tree.css_first(FLIPKART_RATING_SELECTOR)
+        if rating_node:
+            rating_text = self._node_text(rating_node)
+            try:
+                details.rating = float(rating_text)
+            except ValueError:
+                pass
+
+        # Review Count
+        review_node = tree.css_first(FLIPKART_REVIEW_SELECTOR)
+        if review_node:
+            review_text = self._node_text(review_node)
+            try:
+                details.review_count = int(review_text.split()[0].translate(_PRICE_TRANS))
+            except (ValueError, IndexError):
+                pass
+
+        return True
+
 class ProductAnalyzer:
     """Analyzes product data from multiple sources"""
 
+    # Registry of supported platforms; scrapers are only built for the
+    # platforms that actually appear in the URL dict
+    _scraper_classes = {
+        'amazon': AmazonScraper,
+        'flipkart': FlipkartScraper
+    }
+
     def __init__(self):
-        self.scrapers = {
-            'amazon': AmazonScraper(),
-            'flipkart': FlipkartScraper()
-        }
+        self.scrapers = {}
+        self.client = HttpScraperBase.build_client()
 
-    def analyze_product(self, urls: Dict[str, str]) -> Dict:
+    async def analyze_product(self, urls: Dict[str, str]) -> Dict:
         """Analyze product across different platforms"""
         results = []
 
-        for platform, url in urls.items():
-            try:
-                if platform in self.scrapers:
-                    scraper = self.scrapers[platform]
-                    product_details = scraper.scrape_product(url)
-                    results.append(product_details)
-            except Exception as e:
-                logger.error(f"Error analyzing {platform}: {str(e)}")
-
-        # Clean up Selenium drivers
-        for scraper in self.scrapers.values():
-            try:
-                scraper.driver.quit()
-            except:
-                pass
+        # The per-platform scrapes are independent network fetches, so run
+        # them concurrently; total time becomes max() instead of sum()
+        platforms = [p for p in urls if p in self._scraper_classes]
+        for platform in platforms:
+            self.scrapers.setdefault(platform, self._scraper_classes[platform](self.client))
 
-        # Prepare analysis results
-        analysis = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "all_results": [vars(r) for r in results],
-            "error": None
-        }
+        scraped = await asyncio.gather(
+            *[self.scrapers[p].scrape_product(urls[p]) for p in platforms],
+            return_exceptions=True
+        )
+
+        for platform, outcome in zip(platforms, scraped):
+            if isinstance(outcome, Exception):
+                logger.error("Error analyzing %s: %s", platform, outcome)
+            else:
+                results.append(outcome)
 
         # Only add comparative analysis if we have valid prices
         valid_results = [r for r in results if r.price > 0]
 
+        comparison = {}
         if valid_results:
-            best_price = min(valid_results, key=lambda x: x.price)
-            highest_rated = max(valid_results, key=lambda x: x.rating)
-
-            analysis.update({
+            # One pass computes best price, highest rating and the average
+            # instead of separate min/max/sum/any traversals
+            best_price = highest_rated = valid_results[0]
+            rating_sum = 0.0
+            rated_count = 0
+            for r in valid_results:
+                if r.price < best_price.price:
+                    best_price = r
+                if r.rating > highest_rated.rating:
+                    highest_rated = r
+                rating_sum += r.rating
+                rated_count += r.rating > 0
+
+            comparison = {
                 "best_price": {
                     "platform": best_price.platform,
                     "price": best_price.price,
@@ -237,33 +435,56 @@ class ProductAnalyzer:
                     "review_count": highest_rated.review_count,
                     "url": highest_rated.url
                 },
-                "average_rating": round(sum(r.rating for r in valid_results) / len(valid_results), 2)
-                if any(r.rating > 0 for r in valid_results) else 0
-            })
-        else:
-            analysis["error"] = "No valid prices found across platforms"
+                "average_rating": round(rating_sum / len(valid_results), 2)
+                if rated_count else 0
+            }
+
+        # Single literal so the dict is sized once up-front instead of being
+        # rehashed when update() grows it with the comparison keys
+        return {
+            "timestamp": _now_str(),
+            "all_results": [asdict(r) for r in results],
+            "error": None if valid_results else "No valid prices found across platforms",
+            **comparison
+        }
 
-        return analysis
+    async def aclose(self):
+        """Release the shared HTTP client and its pooled connections"""
+        await self.client.aclose()
 
 def save_analysis(analysis: Dict, filename: str = "product_analysis.json"):
     """Save analysis results to JSON file"""
     try:
-        with open(filename, 'w', encoding='utf-8') as output_file:
-            json.dump(analysis, output_file, indent=4, ensure_ascii=False)
-        logger.info(f"Analysis saved to {filename}")
+        if orjson is not None:
+            # orjson writes one C-level bytes buffer, skipping the large
+            # Python-side str intermediate that json.dump's indent path builds
+            with open(filename, 'wb') as output_file:
+                output_file.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as output_file:
+                json.dump(analysis, output_file, indent=4, ensure_ascii=False)
+        logger.info("Analysis saved to %s", filename)
     except Exception as e:
-        logger.error(f"Error saving analysis: {str(e)}")
+        logger.error("Error saving analysis: %s", e)
 
 def main():
     # Example usage
     urls = {
         "amazon": "https://www.amazon.in/Apple-iPhone-15-128GB-Black/dp/B0CHX3QBCH",
-        
+
         "flipkart": "https://www.flipkart.com/apple-iphone-15-black-128-gb/p/itm6ac6485515ae4"
     }
 
     analyzer = ProductAnalyzer()
-    results = analyzer.analyze_product(urls)
+
+    async def run():
+        try:
+            return await analyzer.analyze_product(urls)
+        finally:
+            await analyzer.aclose()
+            await PlaywrightScraperBase.close_browser()
+
+    results = asyncio.run(run())
 
     # Save results
     save_analysis(results)